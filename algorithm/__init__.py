@@ -63,6 +63,23 @@ class SolutionStep:
         return "click {}, and the matrix should be {}".format(self.click, self.target)
 
 
+def trace(came_from: dict[int, tuple[int | None, matrix.Direction | None]], state: int) -> list[matrix.Direction]:
+    """
+    Walk the parent records of a search back from a state to the state without parent.
+
+    :param came_from: A dict mapping each reached state to its parent state and the direction moved from it. The
+        initial state is mapped to (None, None).
+    :param state: The state to walk back from.
+    :return: A list containing the directions to move the space tile towards, from the initial state to state.
+    """
+    directions = []
+    parent, direction = came_from[state]
+    while parent is not None:
+        directions.append(direction)
+        parent, direction = came_from[parent]
+    return directions[::-1]
+
+
 class SolutionAlgorithm:
     """
     A base class, or called `interface`, of all solution-algorithm implementations.
@@ -82,3 +99,19 @@ class SolutionAlgorithm:
         :return: A list containing steps to solve the puzzle, or None if there's no solution found.
         """
         raise UnimplementedException()
+
+    def _replay(self, directions: list[matrix.Direction]) -> list[SolutionStep]:
+        """
+        Protected function, do not call directly. Move the space tile of the initial matrix towards the directions
+        one by one, and generate the solving steps.
+
+        :param directions: Directions to move the space tile towards, all of which must be valid.
+        :return: A list containing the solving steps.
+        """
+        steps = []
+        last_matrix = self.initial
+        for direction in directions:
+            current_matrix = last_matrix.play_only(direction)
+            steps.append(SolutionStep(last_matrix, current_matrix))
+            last_matrix = current_matrix
+        return steps
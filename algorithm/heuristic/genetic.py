@@ -9,82 +9,86 @@ ATTENTION: This algorithm is theoretically correct, but due to lack of computing
 """
 from __future__ import annotations
 
-import copy
-import random
+import concurrent.futures
+import os
+
+import numpy as np
 
 import matrix
 from algorithm import SolutionAlgorithm, SolutionStep
+from util import njit
 
 POPULATION_SIZE = 32768
 FINAL_ADAPTIVITY = 123456
-CROSSOVER_RANGE = POPULATION_SIZE // 2
+ELITE_COUNT = 16
+CROSSOVER_RANGE = (POPULATION_SIZE - ELITE_COUNT) // 2
 CROSSOVER_POSSIBILITY = 0.5
 MUTATE_POSSIBILITY = 0.01
 EVOLUTION_ROUND = 100
+GENE_SYMBOLS = "LURD"
+WORKER_COUNT = os.cpu_count() or 1
+CHUNK_COUNT = WORKER_COUNT * 8
+
+MATRIX_SIZE = matrix.MATRIX_SIZE
+CELL_COUNT = MATRIX_SIZE * MATRIX_SIZE
+TILE_BITS = matrix.TILE_BITS
+TILE_MASK = matrix.TILE_MASK
 
 
-def positional_adaptivity(target: matrix.Matrix, ideal: matrix.Matrix) -> int:
+def ideal_positions(ideal: matrix.Matrix) -> np.ndarray:
     """
-    Calculate one part of adaptivity based on positional arrangements.
+    Build the lookup table of positions in the final matrix, indexed by the packed tile value.
 
-    :param target: The current matrix
     :param ideal: The final matrix
+    :return: An array of shape (TILE_MASK + 1, 2), where table[tile] is the (row, column) of tile in ideal
+    """
+    return np.array(ideal.positions(), dtype=np.int8)
+
+
+@njit(cache=True)
+def positional_adaptivity(state: int, positions: np.ndarray) -> int:
+    """
+    Calculate one part of adaptivity based on positional arrangements. JIT-compiled by Numba if installed.
+
+    :param state: The packed state of current matrix
+    :param positions: The lookup table of positions in the final matrix, see `ideal_positions`
     :return: part of adaptivity value
     """
     value = 0
-    for i in range(matrix.MATRIX_SIZE):
-        for j in range(matrix.MATRIX_SIZE):
-            element = target.fetch(i, j)
-            for m in range(matrix.MATRIX_SIZE):
-                for n in range(matrix.MATRIX_SIZE):
-                    if ideal.fetch(m, n) == element:
-                        value -= (abs(i - m) + abs(j - n)) ** 2
+    for index in range(CELL_COUNT):
+        tile = (state >> (index * TILE_BITS)) & TILE_MASK
+        distance = abs(index // MATRIX_SIZE - positions[tile, 0]) + abs(index % MATRIX_SIZE - positions[tile, 1])
+        value -= distance * distance
     return value
 
 
 class Individual:
     """
-    A class representing an individual in a population, composed of genes and adaptivity.
+    A class representing an individual in a population, composed of genes and adaptivity. The genes are a row of the
+    population array, each of which is a direction.
     """
 
-    def __init__(self, length: int) -> None:
-        if length < 0:
-            return
-        self.gene = [random.choice(matrix.DIRECTIONS) for _ in range(length)]
-        self.adaptivity = 0
+    def __init__(self, gene: np.ndarray, adaptivity: int = 0) -> None:
+        self.gene = gene
+        self.adaptivity = adaptivity
 
     def __str__(self) -> str:
-        result = ""
-        for d in self.gene:
-            if d == matrix.Direction.UP:
-                result += "U"
-            elif d == matrix.Direction.LEFT:
-                result += "L"
-            elif d == matrix.Direction.DOWN:
-                result += "D"
-            elif d == matrix.Direction.RIGHT:
-                result += "R"
-        return result
-
-    def clone(self) -> Individual:
-        result = Individual(-1)
-        result.gene = copy.deepcopy(self.gene)
-        result.adaptivity = copy.deepcopy(self.adaptivity)
-        return result
-
-    def calculate_adaptivity(self, initial: matrix.Matrix, final: matrix.Matrix) -> None:
+        return "".join(GENE_SYMBOLS[d] for d in self.gene)
+
+    def calculate_adaptivity(self, initial: matrix.Matrix, final: matrix.Matrix, positions: np.ndarray) -> None:
         """
         Calculate the whole adaptivity based on positional arrangement and moving steps.
 
         :param initial: The initial matrix with no moving steps applied.
         :param final: The final matrix to compare.
+        :param positions: The lookup table of positions in the final matrix, see `ideal_positions`.
         """
         self.adaptivity = 0
         candidate = initial.clone()
         last_candidate = candidate
-        for i, direction in enumerate(self.gene):
+        for i, d in enumerate(self.gene):
             last_candidate = candidate
-            candidate = candidate.play_only(direction)
+            candidate = candidate.play_only(d)
             if candidate is None:
                 self.adaptivity += i
                 break
@@ -92,7 +96,30 @@ class Individual:
                 self.gene = self.gene[:i + 1]
                 self.adaptivity = FINAL_ADAPTIVITY
                 return
-        self.adaptivity += positional_adaptivity(last_candidate, final)
+        self.adaptivity += positional_adaptivity(last_candidate.state, positions)
+
+
+def evaluate_genes(genes: np.ndarray, initial: matrix.Matrix, final: matrix.Matrix,
+                   positions: np.ndarray) -> np.ndarray:
+    """
+    Calculate the adaptivity of a chunk of the population. Runs in worker processes, thus must stay at module level.
+    Once a row reaches the final matrix, the rest of the chunk is skipped.
+
+    :param genes: A chunk of rows of the population array.
+    :param initial: The initial matrix with no moving steps applied.
+    :param final: The final matrix to compare.
+    :param positions: The lookup table of positions in the final matrix, see `ideal_positions`.
+    :return: An array containing the adaptivity of each row, or of the rows up to the first one whose adaptivity is
+        `FINAL_ADAPTIVITY`.
+    """
+    adaptivity = np.zeros(len(genes), dtype=np.int32)
+    for index, gene in enumerate(genes):
+        individual = Individual(gene)
+        individual.calculate_adaptivity(initial, final, positions)
+        adaptivity[index] = individual.adaptivity
+        if individual.adaptivity == FINAL_ADAPTIVITY:
+            return adaptivity[:index + 1]
+    return adaptivity
 
 
 class GeneticAlgorithm(SolutionAlgorithm):
@@ -108,7 +135,10 @@ class GeneticAlgorithm(SolutionAlgorithm):
     def __init__(self, depth_limit: int, initial_matrix: matrix.Matrix, final_matrix: matrix.Matrix) -> None:
         super().__init__(initial_matrix, final_matrix)
         self.depth_limit = depth_limit
-        self.population = [Individual(depth_limit) for _ in range(POPULATION_SIZE)]
+        self.positions = ideal_positions(self.final)
+        self.population = np.random.randint(0, len(matrix.DIRECTIONS), size=(POPULATION_SIZE, depth_limit),
+                                            dtype=np.int8)
+        self.adaptivity = np.zeros(POPULATION_SIZE, dtype=np.int32)
 
     def __str__(self) -> str:
         return "depth-limited Genetic Algorithm (depth_limit={}, evolution_round={})".format(self.depth_limit,
@@ -117,89 +147,104 @@ class GeneticAlgorithm(SolutionAlgorithm):
     def solve(self) -> list[SolutionStep] | None:
         """
         Typical routine of genetic algorithm: select, crossover and mutate. Evaluation is performed before all those
-        steps.
+        steps, by `WORKER_COUNT` processes shared across all evolution rounds.
 
         :return: A list containing steps to solve the puzzle, or None if there's no solution found.
         """
-        for r in range(EVOLUTION_ROUND):
-            evaluation = self._evaluate()
-            if evaluation is not None:
-                return evaluation
-            print("evolution round {}, max adaptivity {}, individual {}".format(r, self.population[0].adaptivity,
-                                                                                self.population[0]))
-            self._select()
-            self._crossover()
-            self._mutate()
+        with concurrent.futures.ProcessPoolExecutor(WORKER_COUNT) as executor:
+            for r in range(EVOLUTION_ROUND):
+                evaluation = self._evaluate(executor)
+                if evaluation is not None:
+                    return evaluation
+                print("evolution round {}, max adaptivity {}, individual {}".format(r, self.adaptivity[0],
+                                                                                    Individual(self.population[0])))
+                self._select()
+                self._crossover()
+                self._mutate()
         return None
 
-    def _evaluate(self) -> list[SolutionStep] | None:
+    def _evaluate(self, executor: concurrent.futures.Executor) -> list[SolutionStep] | None:
         """
         Protected function, do not call directly.
 
-        Evaluation is performed before evolution steps. Firstly, calculate the adaptivity of all individuals. Then
-        sort the population according to the adaptivity descending-ly. If there's a solution, generate steps and return.
+        Evaluation is performed before evolution steps. Firstly, calculate the adaptivity of all individuals, split
+        into `CHUNK_COUNT` chunks. If there's a solution, stop evaluating and generate steps to return. Otherwise, sort
+        the population according to the adaptivity descending-ly.
 
+        :param executor: The executor to calculate the adaptivity of chunks with.
         :return: A list containing steps to solve the puzzle, or None if there's no solution found.
         """
-        for individual in self.population:
-            individual.calculate_adaptivity(self.initial, self.final)
-        self.population.sort(reverse=True, key=lambda i: i.adaptivity)
-        if self.population[0].adaptivity == FINAL_ADAPTIVITY:
+        bounds = np.linspace(0, POPULATION_SIZE, CHUNK_COUNT + 1, dtype=int)
+        futures = {executor.submit(evaluate_genes, self.population[start:stop], self.initial, self.final,
+                                   self.positions): start for start, stop in zip(bounds[:-1], bounds[1:])}
+        solution = None
+        for future in concurrent.futures.as_completed(futures):
+            start = futures[future]
+            adaptivity = future.result()
+            if len(adaptivity) > 0 and adaptivity[-1] == FINAL_ADAPTIVITY:
+                for other in futures:
+                    other.cancel()
+                solution = Individual(self.population[start + len(adaptivity) - 1])
+                break
+            self.adaptivity[start:start + len(adaptivity)] = adaptivity
+        if solution is not None:
+            solution.calculate_adaptivity(self.initial, self.final, self.positions)
             steps = []
             last_matrix = self.initial.clone()
-            for gene in self.population[0].gene:
-                current_matrix = last_matrix.play_only(gene)
+            for d in solution.gene:
+                current_matrix = last_matrix.play_only(d)
                 steps.append(SolutionStep(last_matrix, current_matrix))
                 last_matrix = current_matrix
             return steps
+        order = np.argsort(-self.adaptivity, kind="stable")
+        self.population = self.population[order]
+        self.adaptivity = self.adaptivity[order]
         return None
 
     def _select(self) -> None:
         """
         Protected function, do not call directly.
 
-        The select step of evolution. Firstly select two individuals from the population, repeat is allowed. Then
-        compare those two individuals' adaptivity, the greater one will be put in the new population. This operation
-        will repeat for `POPULATION_SIZE` times, in order to produce a new population with the same size as the old one.
+        The select step of evolution. The first `ELITE_COUNT` individuals, which are the fittest ones since the
+        population is sorted in evaluation, are put in the new population unchanged. Then select two individuals from
+        the population, repeat is allowed. Then compare those two individuals' adaptivity, the greater one will be put
+        in the new population. This operation will repeat for `POPULATION_SIZE - ELITE_COUNT` times, in order to
+        produce a new population with the same size as the old one.
         """
-        new_population = []
-        while len(new_population) < POPULATION_SIZE:
-            a: Individual = random.choice(self.population)
-            b: Individual = random.choice(self.population)
-            new_population.append(a.clone() if a.adaptivity >= b.adaptivity else b.clone())
-        self.population = new_population
+        a = np.random.randint(0, POPULATION_SIZE, POPULATION_SIZE - ELITE_COUNT)
+        b = np.random.randint(0, POPULATION_SIZE, POPULATION_SIZE - ELITE_COUNT)
+        winners = np.concatenate((np.arange(ELITE_COUNT), np.where(self.adaptivity[a] >= self.adaptivity[b], a, b)))
+        self.population = self.population[winners]
+        self.adaptivity = self.adaptivity[winners]
 
     def _crossover(self) -> None:
         """
         Protected function, do not call directly.
 
-        The crossover step of evolution. Select two non-repeat individuals from the population, and generate a
-        possibility while iterating the genes. If the possibility is smaller than the `CROSSOVER_POSSIBILITY`,
-        then perform the crossover of genes on the position between two individuals.
+        The crossover step of evolution. Pair up `CROSSOVER_RANGE` couples of non-repeat individuals from the
+        population, elites excluded, and generate a possibility for every position of their genes. If the possibility
+        is smaller than the `CROSSOVER_POSSIBILITY`, then perform the crossover of genes on the position between two
+        individuals.
         """
-        for _ in range(CROSSOVER_RANGE):
-            a: Individual = random.choice(self.population)
-            b: Individual = random.choice(self.population)
-            while b is a:
-                b = random.choice(self.population)
-            for i in range(self.depth_limit):
-                swap = True if random.random() < CROSSOVER_POSSIBILITY else False
-                if swap:
-                    a.gene[i], b.gene[i] = b.gene[i], a.gene[i]
+        indices = ELITE_COUNT + np.random.permutation(POPULATION_SIZE - ELITE_COUNT)
+        a, b = indices[:CROSSOVER_RANGE], indices[CROSSOVER_RANGE:2 * CROSSOVER_RANGE]
+        swap = np.random.random((CROSSOVER_RANGE, self.depth_limit)) < CROSSOVER_POSSIBILITY
+        genes_a, genes_b = self.population[a], self.population[b]
+        self.population[a] = np.where(swap, genes_b, genes_a)
+        self.population[b] = np.where(swap, genes_a, genes_b)
 
     def _mutate(self) -> None:
         """
         Protected function, do not call directly.
 
-        The mutate step of evolution. For an individual, select two different positions of the genes, and generate a
-        possibility. If the possibility is smaller than `MUTATE_POSSIBILITY`, a swap operation is performed
-        indicating a mutation.
+        The mutate step of evolution. For an individual other than elites, select two different positions of the
+        genes, and generate a possibility. If the possibility is smaller than `MUTATE_POSSIBILITY`, a swap operation is
+        performed indicating a mutation.
         """
-        for individual in self.population:
-            mutate = True if random.random() < MUTATE_POSSIBILITY else False
-            if mutate:
-                pos_a = random.randrange(self.depth_limit)
-                pos_b = random.randrange(self.depth_limit)
-                while pos_b == pos_a:
-                    pos_b = random.randrange(self.depth_limit)
-                individual.gene[pos_a], individual.gene[pos_b] = individual.gene[pos_b], individual.gene[pos_a]
+        if self.depth_limit < 2:
+            return
+        rows = ELITE_COUNT + np.nonzero(np.random.random(POPULATION_SIZE - ELITE_COUNT) < MUTATE_POSSIBILITY)[0]
+        pos_a = np.random.randint(0, self.depth_limit, len(rows))
+        pos_b = (pos_a + np.random.randint(1, self.depth_limit, len(rows))) % self.depth_limit
+        self.population[rows, pos_a], self.population[rows, pos_b] = (self.population[rows, pos_b],
+                                                                      self.population[rows, pos_a])
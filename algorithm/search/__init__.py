@@ -4,5 +4,8 @@ Created on: March 11th, 2023
 
 A module containing search algorithms to solve the puzzle.
 """
+from algorithm.search.astar import AStarSearch
+from algorithm.search.astar_jit import JitAStarSearch
 from algorithm.search.bfs import BreadthFirstSearch
+from algorithm.search.bidirectional import BidirectionalSearch
 from algorithm.search.dfs import DepthFirstSearch
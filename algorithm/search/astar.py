@@ -0,0 +1,78 @@
+"""
+Author: Cylix Lee (cylix.lee@foxmail.com).
+Created on: October 14th, 2026
+
+A* Search algorithm to solve the puzzle.
+"""
+from __future__ import annotations
+
+import heapq
+import itertools
+
+import matrix
+from algorithm import SolutionAlgorithm, SolutionStep, trace
+
+
+class AStarSearch(SolutionAlgorithm):
+    """
+    The A* algorithm class that performs best-first search guided by the Manhattan distance between the tiles and
+    their final positions. Since the heuristic is admissible and consistent, this algorithm returns the optimal
+    solution, if any, just like BFS.
+
+    However, A* expands far fewer matrices than BFS, thus takes a much shorter time to solve the puzzle.
+    """
+
+    def __str__(self) -> str:
+        return "A* Search (Manhattan distance)"
+
+    def solve(self) -> list[SolutionStep] | None:
+        distances = self._distances()
+        initial_state, final_state = self.initial.state, self.final.state
+        initial_h = 0
+        for index in range(matrix.MATRIX_SIZE * matrix.MATRIX_SIZE):
+            initial_h += distances[(initial_state >> index * matrix.TILE_BITS) & matrix.TILE_MASK][index]
+        order = itertools.count()
+        frontier = [(initial_h, next(order), 0, initial_h, initial_state, self.initial.space_index)]
+        came_from = {initial_state: (None, None)}
+        best_g = {initial_state: 0}
+        closed = set()
+        while frontier:
+            _, _, g, h, state, space_index = heapq.heappop(frontier)
+            if state in closed:
+                continue
+            if state == final_state:
+                return self._replay(trace(came_from, state))
+            closed.add(state)
+            for move in matrix.MOVES[space_index]:
+                direction, new_space_index, _, moved_shift = move
+                new_state = matrix.apply_move(state, move)
+                if new_state in closed:
+                    continue
+                new_g = g + 1
+                if new_g >= best_g.get(new_state, new_g + 1):
+                    continue
+                best_g[new_state] = new_g
+                came_from[new_state] = (state, direction)
+                tile = (state >> moved_shift) & matrix.TILE_MASK
+                new_h = h - distances[tile][new_space_index] + distances[tile][space_index]
+                heapq.heappush(frontier, (new_g + new_h, next(order), new_g, new_h, new_state, new_space_index))
+        return None
+
+    def _distances(self) -> list[list[int]]:
+        """
+        Protected function, do not call directly.
+
+        Build the lookup table of Manhattan distances, where table[tile][index] is the distance between the position
+        index (row * MATRIX_SIZE + column) and the final position of tile, indexed by the packed tile value. The
+        space tile is not counted, so that the heuristic stays admissible.
+
+        :return: The lookup table of Manhattan distances.
+        """
+        table = [[0] * (matrix.MATRIX_SIZE * matrix.MATRIX_SIZE) for _ in range(matrix.TILE_MASK + 1)]
+        positions = self.final.positions()
+        for tile in range(1, matrix.MATRIX_SIZE * matrix.MATRIX_SIZE):
+            m, n = positions[tile]
+            for index in range(matrix.MATRIX_SIZE * matrix.MATRIX_SIZE):
+                i, j = divmod(index, matrix.MATRIX_SIZE)
+                table[tile][index] = abs(i - m) + abs(j - n)
+        return table
@@ -0,0 +1,176 @@
+"""
+Author: Cylix Lee (cylix.lee@foxmail.com).
+Created on: October 14th, 2026
+
+A* Search algorithm to solve the puzzle, whose search loop is JIT-compiled by Numba.
+"""
+from __future__ import annotations
+
+import numpy as np
+
+import matrix
+from algorithm import SolutionStep
+from algorithm.search.astar import AStarSearch
+from util import njit
+
+TILE_BITS = matrix.TILE_BITS
+TILE_MASK = matrix.TILE_MASK
+HEAP_CAPACITY = 1024
+
+
+def _build_move_arrays() -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Flatten `matrix.MOVES` into arrays that can be used in compiled code. The moves of space position i are
+    move_spaces[move_offsets[i]:move_offsets[i + 1]], along with their directions.
+
+    :return: A tuple of (move_offsets, move_spaces, move_directions).
+    """
+    move_offsets = [0]
+    move_spaces = []
+    move_directions = []
+    for moves in matrix.MOVES:
+        for direction, space_index, _, _ in moves:
+            move_spaces.append(space_index)
+            move_directions.append(direction)
+        move_offsets.append(len(move_spaces))
+    return (np.array(move_offsets, dtype=np.int64), np.array(move_spaces, dtype=np.int64),
+            np.array(move_directions, dtype=np.int64))
+
+
+MOVE_OFFSETS, MOVE_SPACES, MOVE_DIRECTIONS = _build_move_arrays()
+
+
+@njit(cache=True)
+def _heap_less(heap: np.ndarray, a: int, b: int) -> bool:
+    """
+    Compare two entries of the heap by f value, then by the order they are pushed.
+    """
+    return heap[a, 0] < heap[b, 0] or (heap[a, 0] == heap[b, 0] and heap[a, 1] < heap[b, 1])
+
+
+@njit(cache=True)
+def _heap_push(heap: np.ndarray, size: int, f: int, order: int, g: int, state: int, space: int) -> np.ndarray:
+    """
+    Push an entry of (f, order, g, state, space index) into the heap, whose first size rows are in use.
+
+    :return: The heap, which is a new array if it has to grow.
+    """
+    if size == len(heap):
+        grown = np.empty((len(heap) * 2, heap.shape[1]), dtype=heap.dtype)
+        grown[:size] = heap
+        heap = grown
+    heap[size, 0], heap[size, 1], heap[size, 2], heap[size, 3], heap[size, 4] = f, order, g, state, space
+    child = size
+    while child > 0:
+        parent = (child - 1) // 2
+        if not _heap_less(heap, child, parent):
+            break
+        for column in range(heap.shape[1]):
+            heap[child, column], heap[parent, column] = heap[parent, column], heap[child, column]
+        child = parent
+    return heap
+
+
+@njit(cache=True)
+def _heap_pop(heap: np.ndarray, size: int) -> np.ndarray:
+    """
+    Pop the least entry out of the heap, whose first size rows are in use.
+
+    :return: A copy of the least entry.
+    """
+    top = heap[0].copy()
+    heap[0] = heap[size - 1]
+    size -= 1
+    parent = 0
+    while True:
+        least = parent
+        for child in (2 * parent + 1, 2 * parent + 2):
+            if child < size and _heap_less(heap, child, least):
+                least = child
+        if least == parent:
+            break
+        for column in range(heap.shape[1]):
+            heap[least, column], heap[parent, column] = heap[parent, column], heap[least, column]
+        parent = least
+    return top
+
+
+@njit(cache=True)
+def astar(initial_state: int, initial_space: int, final_state: int, distances: np.ndarray,
+          move_offsets: np.ndarray, move_spaces: np.ndarray, move_directions: np.ndarray) -> np.ndarray:
+    """
+    Perform A* search over packed states, guided by the Manhattan distance.
+
+    :param initial_state: The packed state of the initial matrix.
+    :param initial_space: The space index of the initial matrix.
+    :param final_state: The packed state of the final matrix.
+    :param distances: The lookup table of Manhattan distances, see `AStarSearch._distances`.
+    :param move_offsets: See `_build_move_arrays`.
+    :param move_spaces: See `_build_move_arrays`.
+    :param move_directions: See `_build_move_arrays`.
+    :return: An array containing the directions to move the space tile towards, or an array
+        containing only -1 if there's no solution.
+    """
+    initial_h = 0
+    for index in range(len(distances[0])):
+        initial_h += distances[(initial_state >> (index * TILE_BITS)) & TILE_MASK, index]
+    heap = np.empty((HEAP_CAPACITY, 5), dtype=np.int64)
+    heap = _heap_push(heap, 0, initial_h, 0, 0, initial_state, initial_space)
+    size, order = 1, 1
+    came_from = {initial_state: -1}
+    best_g = {initial_state: 0}
+    # Numba types a set by its literal, thus the closed set starts from one element and is emptied.
+    closed = {initial_state}
+    closed.clear()
+    while size > 0:
+        entry = _heap_pop(heap, size)
+        size -= 1
+        f, g, state, space_index = entry[0], entry[2], entry[3], entry[4]
+        if state in closed:
+            continue
+        if state == final_state:
+            directions = []
+            record = came_from[state]
+            while record != -1:
+                directions.append(record & 3)
+                record = came_from[record >> 2]
+            return np.array(directions[::-1], dtype=np.int64)
+        closed.add(state)
+        h = f - g
+        for move in range(move_offsets[space_index], move_offsets[space_index + 1]):
+            new_space_index = move_spaces[move]
+            space_shift, moved_shift = space_index * TILE_BITS, new_space_index * TILE_BITS
+            tile = (state >> moved_shift) & TILE_MASK
+            new_state = state ^ (tile << space_shift) ^ (tile << moved_shift)
+            if new_state in closed:
+                continue
+            new_g = g + 1
+            if new_state in best_g and new_g >= best_g[new_state]:
+                continue
+            best_g[new_state] = new_g
+            came_from[new_state] = (state << 2) | move_directions[move]
+            new_h = h - distances[tile, new_space_index] + distances[tile, space_index]
+            heap = _heap_push(heap, size, new_g + new_h, order, new_g, new_state, new_space_index)
+            size += 1
+            order += 1
+    return np.full(1, -1, dtype=np.int64)
+
+
+class JitAStarSearch(AStarSearch):
+    """
+    The A* algorithm class that performs exactly the same search as `AStarSearch`, but the whole search loop is
+    JIT-compiled by Numba, thus each expansion costs a handful of machine instructions.
+
+    Note that the first run compiles the search loop, which is cached for subsequent runs.
+    """
+
+    def __str__(self) -> str:
+        return "JIT-compiled A* Search (Manhattan distance)"
+
+    def solve(self) -> list[SolutionStep] | None:
+        distances = np.array(self._distances(), dtype=np.int64)
+        directions = astar(self.initial.state, self.initial.space_index, self.final.state, distances, MOVE_OFFSETS,
+                           MOVE_SPACES, MOVE_DIRECTIONS)
+        if len(directions) > 0 and directions[0] == -1:
+            return None
+        return self._replay(directions.tolist())
@@ -6,10 +6,10 @@ Breadth-First Search algorithm to solve the puzzle.
 """
 from __future__ import annotations
 
-import queue
+from collections import deque
 
 import matrix
-from algorithm import SolutionAlgorithm, SolutionStep
+from algorithm import SolutionAlgorithm, SolutionStep, trace
 
 
 class BreadthFirstSearch(SolutionAlgorithm):
@@ -24,16 +24,15 @@ class BreadthFirstSearch(SolutionAlgorithm):
         return "Breadth-First Search"
 
     def solve(self) -> list[SolutionStep] | None:
-        matrix_queue = queue.Queue()
-        matrix_queue.put(self.initial)
-        while matrix_queue.qsize() > 0:
-            target: matrix.Matrix = matrix_queue.get()
-            if target == self.final:
-                steps = []
-                while target.parent is not None:
-                    steps.append(SolutionStep(target.parent, target))
-                    target = target.parent
-                return steps[::-1]
-            for new_target in target.play():
-                if new_target not in target.parents():
-                    matrix_queue.put(new_target)
+        final_state = self.final.state
+        came_from = {self.initial.state: (None, None)}
+        state_queue = deque([self.initial.state])
+        while state_queue:
+            state = state_queue.popleft()
+            if state == final_state:
+                return self._replay(trace(came_from, state))
+            for new_state, direction in matrix.successors(state):
+                if new_state not in came_from:
+                    came_from[new_state] = (state, direction)
+                    state_queue.append(new_state)
+        return None
@@ -0,0 +1,99 @@
+"""
+Author: Cylix Lee (cylix.lee@foxmail.com).
+Created on: October 14th, 2026
+
+Bidirectional Breadth-First Search algorithm to solve the puzzle.
+"""
+from __future__ import annotations
+
+from collections import deque
+
+import matrix
+from algorithm import SolutionAlgorithm, SolutionStep
+
+
+class BidirectionalSearch(SolutionAlgorithm):
+    """
+    The bidirectional BFS algorithm class that performs two searches at the same time, one forward from the initial
+    matrix and one backward from the final matrix, until they meet in the middle. Since every move is reversible,
+    the backward search moves the space tile just like the forward one. Like BFS, this algorithm returns the optimal
+    solution, if any.
+
+    Compared to BFS, each search only goes half the depth, thus far fewer matrices are explored.
+    """
+
+    def __str__(self) -> str:
+        return "Bidirectional Breadth-First Search"
+
+    def solve(self) -> list[SolutionStep] | None:
+        initial_state, final_state = self.initial.state, self.final.state
+        if initial_state == final_state:
+            return []
+        forward = {initial_state: None}
+        backward = {final_state: None}
+        forward_queue = deque([(initial_state, self.initial.space_index)])
+        backward_queue = deque([(final_state, self.final.space_index)])
+        while forward_queue and backward_queue:
+            if len(forward_queue) <= len(backward_queue):
+                meeting = self._expand(forward_queue, forward, backward)
+            else:
+                meeting = self._expand(backward_queue, backward, forward)
+            if meeting is not None:
+                return self._steps(forward, backward, meeting)
+        return None
+
+    @staticmethod
+    def _expand(state_queue: deque[tuple[int, int]], parents: dict[int, int | None],
+                others: dict[int, int | None]) -> int | None:
+        """
+        Protected function, do not call directly.
+
+        Expand one whole layer of a search, so that the first meeting found is on a shortest path.
+
+        :param state_queue: The frontier of the search to expand, containing (state, space index) pairs.
+        :param parents: A dict mapping each state reached by this search to its parent state.
+        :param others: The same dict of the opposite search.
+        :return: The state where both searches meet, or None if they haven't met yet.
+        """
+        for _ in range(len(state_queue)):
+            state, space_index = state_queue.popleft()
+            for move in matrix.MOVES[space_index]:
+                new_state = matrix.apply_move(state, move)
+                if new_state in parents:
+                    continue
+                parents[new_state] = state
+                if new_state in others:
+                    return new_state
+                state_queue.append((new_state, move[1]))
+        return None
+
+    def _steps(self, forward: dict[int, int | None], backward: dict[int, int | None],
+               meeting: int) -> list[SolutionStep]:
+        """
+        Protected function, do not call directly.
+
+        Splice the parent chains of both searches at the meeting state, then replay the states on the initial matrix
+        to generate the solving steps.
+
+        :param forward: A dict mapping each state reached by the forward search to its parent state.
+        :param backward: A dict mapping each state reached by the backward search to its parent state.
+        :param meeting: The state where both searches meet.
+        :return: A list containing the solving steps.
+        """
+        states = []
+        state = meeting
+        while state is not None:
+            states.append(state)
+            state = forward[state]
+        states.reverse()
+        state = backward[meeting]
+        while state is not None:
+            states.append(state)
+            state = backward[state]
+        steps = []
+        last_matrix = self.initial
+        for state in states[1:]:
+            current_matrix = next(candidate for candidate in last_matrix.play() if candidate.state == state)
+            steps.append(SolutionStep(last_matrix, current_matrix))
+            last_matrix = current_matrix
+        return steps
@@ -25,31 +25,33 @@ class DepthFirstSearch(SolutionAlgorithm):
     def __str__(self) -> str:
         return "depth-limited Depth-First Search (depth_limit={})".format(self.depth_limit)
 
-    def solve(self) -> list[SolutionStep]:
-        return self._dfs(1, self.initial)
-
-    def _dfs(self, depth: int, target: matrix.Matrix) -> list[SolutionStep] | None:
+    def solve(self) -> list[SolutionStep] | None:
         """
-        Protected function, do not call directly. DFS algorithms are often implemented through a recurrence form.
+        DFS algorithms are often implemented through a recurrence form. Instead, this implementation keeps an explicit
+        stack of the states on the current path, each along with the direction moved from its parent and an iterator
+        over its successors, and a set of those states to avoid going back. Matrices are only generated for the
+        solving steps.
 
-        :param depth: Current depth. If the depth is bigger than the depth limit given in constructor, this function
-            will immediately return.
-        :param target: The matrix to work on.
         :return: A list containing the solving steps, or None if there's no solution within given depth limit.
         """
-        if depth > self.depth_limit:
+        if self.depth_limit < 1:
             return None
-        parents = target.parents()
-        children = [candidate for candidate in target.play() if candidate not in parents]
-        for child in children:
-            if child == self.final:
-                iterator = child
-                steps = []
-                while iterator.parent is not None:
-                    steps.append(SolutionStep(iterator.parent, iterator))
-                    iterator = iterator.parent
-                return steps[::-1]
-            child_dfs = self._dfs(depth + 1, child)
-            if child_dfs is not None:
-                return child_dfs
+        final_state = self.final.state
+        stack = [(self.initial.state, None, iter(matrix.successors(self.initial.state)))]
+        visited = {self.initial.state}
+        while stack:
+            state, _, children = stack[-1]
+            child = next(children, None)
+            if child is None:
+                stack.pop()
+                visited.remove(state)
+                continue
+            child_state, direction = child
+            if child_state in visited:
+                continue
+            if child_state == final_state:
+                return self._replay([entry[1] for entry in stack[1:]] + [direction])
+            if len(stack) < self.depth_limit:
+                visited.add(child_state)
+                stack.append((child_state, direction, iter(matrix.successors(child_state))))
         return None
@@ -21,6 +21,9 @@ if __name__ == "__main__":
     print(" 1. BFS (Breadth-First Search) [Default]")
     print(" 2. depth-limited DFS (Depth-First Search)")
     print(" 3. depth-limited Genetic Algorithm (Heuristic)")
+    print(" 4. A* Search (Heuristic Search)")
+    print(" 5. Bidirectional BFS (Breadth-First Search)")
+    print(" 6. JIT-compiled A* Search (Heuristic Search, requires Numba to be fast)")
 
     alg_index = input()
     try:
@@ -35,6 +38,12 @@ if __name__ == "__main__":
     elif alg_index == 3:
         print("depth-limited Genetic Algorithm needs a depth limit, please input:")
         alg = algorithm.heuristic.GeneticAlgorithm(int(input()), initial, final)
+    elif alg_index == 4:
+        alg = algorithm.search.AStarSearch(initial, final)
+    elif alg_index == 5:
+        alg = algorithm.search.BidirectionalSearch(initial, final)
+    elif alg_index == 6:
+        alg = algorithm.search.JitAStarSearch(initial, final)
 
     print("Solving the puzzle with {}...".format(alg))
     solution = alg.solve()
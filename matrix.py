@@ -9,14 +9,17 @@ directions or fewer.
 """
 from __future__ import annotations
 
-import copy
-import enum
+import functools
 
 import util
 
 MATRIX_SIZE = 3
 SPACE_SYMBOL = "#"
 SPACE_VALUE = -1
+TILE_BITS = 4
+TILE_MASK = 0xF
+SPACE_TILE = 0
+SUCCESSOR_CACHE_SIZE = 1 << 18
 
 
 def boundary_check(candidates: list[int]) -> bool:
@@ -32,28 +35,85 @@ def boundary_check(candidates: list[int]) -> bool:
     return True
 
 
-class Direction(enum.Enum):
+def tile_shift(row: int, column: int) -> int:
     """
-    An enum class representing directions the space tile can move towards.
+    Calculate the bit offset of the tile on position (row, column) inside the packed state of a matrix.
+
+    :param row: Row index of the tile.
+    :param column: Column index of the tile.
+    :return: The number of bits the tile should be shifted by.
+    """
+    return (row * MATRIX_SIZE + column) * TILE_BITS
+
+
+# Directions the space tile can move towards, represented as plain indices of DX and DY, which are the deltas of row
+# and column respectively.
+Direction = int
+LEFT, UP, RIGHT, DOWN = 0, 1, 2, 3
+DIRECTIONS = (LEFT, UP, RIGHT, DOWN)
+DX = (0, -1, 0, 1)
+DY = (-1, 0, 1, 0)
+
+
+def _build_moves() -> tuple[tuple[tuple[Direction, int, int, int], ...], ...]:
+    """
+    Enumerate every valid move of the space tile, indexed by the position of the space tile (row * MATRIX_SIZE +
+    column). Each move is a tuple of (direction, new space position, shift of the space tile, shift of the tile to be
+    exchanged), in the same order as DIRECTIONS.
+
+    :return: A tuple containing the valid moves for each space tile position.
+    """
+    moves = []
+    for space_index in range(MATRIX_SIZE * MATRIX_SIZE):
+        space_x, space_y = divmod(space_index, MATRIX_SIZE)
+        candidates = []
+        for direction in DIRECTIONS:
+            x, y = space_x + DX[direction], space_y + DY[direction]
+            if not boundary_check([x, y]):
+                continue
+            candidates.append((direction, x * MATRIX_SIZE + y, tile_shift(space_x, space_y), tile_shift(x, y)))
+        moves.append(tuple(candidates))
+    return tuple(moves)
+
+
+MOVES = _build_moves()
+MOVES_TOWARDS = tuple(tuple({move[0]: move for move in moves}.get(direction) for direction in DIRECTIONS)
+                      for moves in MOVES)
+
+
+def apply_move(state: int, move: tuple[Direction, int, int, int]) -> int:
     """
-    LEFT = (0, -1)
-    UP = (-1, 0)
-    RIGHT = (0, 1)
-    DOWN = (1, 0)
+    Apply an entry of `MOVES` to a packed state, exchanging the space tile with its neighbour.
+
+    :param state: The packed state, whose space tile position must be the same as the move.
+    :param move: A precomputed move taken from `MOVES`.
+    :return: The packed state after moving the space tile.
+    """
+    _, _, space_shift, moved_shift = move
+    tile = (state >> moved_shift) & TILE_MASK
+    return state ^ (tile << space_shift) ^ (tile << moved_shift)
+
 
+@functools.lru_cache(maxsize=SUCCESSOR_CACHE_SIZE)
+def successors(state: int) -> tuple[tuple[int, Direction], ...]:
+    """
+    Generate the packed states reachable by moving the space tile once, in the same order as `Matrix.play`. The
+    results are cached, since the same state is often reached through different paths and searches.
 
-DIRECTIONS = [
-    Direction.LEFT,
-    Direction.UP,
-    Direction.RIGHT,
-    Direction.DOWN,
-]
+    :param state: The packed state of a well-formed matrix.
+    :return: A tuple containing (new state, direction) pairs.
+    """
+    space_index = 0
+    while (state >> space_index * TILE_BITS) & TILE_MASK != SPACE_TILE:
+        space_index += 1
+    return tuple((apply_move(state, move), move[0]) for move in MOVES[space_index])
 
 
 class Matrix:
     """
-    A class representing the arrangement of puzzle, whose inner data structure is a two-dimensional list. This class
-    provides useful operations, since operating the list is not recommended and may lead to unexpected behaviours.
+    A class representing the arrangement of puzzle, whose inner data structure is a single integer packing every tile
+    into `TILE_BITS` bits, in row-major order. The space tile is stored as `SPACE_TILE`. This class provides useful
+    operations, since operating the packed state is not recommended and may lead to unexpected behaviours.
     """
 
     def __init__(self, data: list[str] = None) -> None:
@@ -63,8 +123,8 @@ class Matrix:
 
         :param data: Optional, a list containing 3 str, with 3 letters each.
         """
-        self._arrangement = [[SPACE_VALUE for _ in range(MATRIX_SIZE)] for _ in range(MATRIX_SIZE)]
-        self._space_position = None
+        self._state = 0
+        self._space_index = None
         self.parent = None
         self.last_direction = None
         if data is None:
@@ -92,10 +152,41 @@ class Matrix:
                 self.place(line_index, char_index, number)
 
     def __str__(self) -> str:
-        return "Matrix({})".format(str(self._arrangement))
+        arrangement = [[self.fetch(i, j) for j in range(MATRIX_SIZE)] for i in range(MATRIX_SIZE)]
+        return "Matrix({})".format(str(arrangement))
 
     def __eq__(self, other: Matrix) -> bool:
-        return self._arrangement == other._arrangement
+        return self._state == other._state
+
+    def __hash__(self) -> int:
+        return self._state
+
+    @property
+    def space_index(self) -> int:
+        """
+        The position of the space tile, as row * MATRIX_SIZE + column. Often used to look up `MOVES`.
+        """
+        return self._space_index
+
+    @property
+    def state(self) -> int:
+        """
+        The packed integer state of the arrangement. Often used as the key of visited sets.
+        """
+        return self._state
+
+    def positions(self) -> list[tuple[int, int]]:
+        """
+        Build the lookup table of positions in self, indexed by the packed tile value, where the space tile is indexed
+        by `SPACE_TILE`. Often built once for the final matrix to compare with.
+
+        :return: A list of length TILE_MASK + 1, where table[tile] is the (row, column) of tile. Tiles absent in self
+            are mapped to (0, 0).
+        """
+        table = [(0, 0)] * (TILE_MASK + 1)
+        for index in range(MATRIX_SIZE * MATRIX_SIZE):
+            table[(self._state >> index * TILE_BITS) & TILE_MASK] = divmod(index, MATRIX_SIZE)
+        return table
 
     def parents(self) -> list[Matrix]:
         """
@@ -110,6 +201,19 @@ class Matrix:
             iterator = iterator.parent
         return result
 
+    @classmethod
+    def _empty(cls) -> Matrix:
+        """
+        Protected function, do not call directly. Create a Matrix instance without running the constructor, whose
+        state and space tile position must be assigned by the caller.
+
+        :return: A new Matrix instance without parent.
+        """
+        mat = cls.__new__(cls)
+        mat.parent = None
+        mat.last_direction = None
+        return mat
+
     def clone(self) -> Matrix:
         """
         Clone this Matrix instance. The new instance has the same data with the original one, but is independent in
@@ -117,40 +221,58 @@ class Matrix:
 
         :return: A new Matrix instance with its memory independent of the original one.
         """
-        mat = Matrix()
-        mat._arrangement = copy.deepcopy(self._arrangement)
-        mat._space_position = copy.deepcopy(self._space_position)
+        mat = Matrix._empty()
+        mat._state = self._state
+        mat._space_index = self._space_index
         return mat
 
     def place(self, row: int, column: int, number: int) -> None:
         """
-        Place a certain number in the position (row, column) of Matrix.
+        Place a certain number in the position (row, column) of Matrix. The position is not checked, thus must be
+        valid.
         """
-        if not boundary_check([row, column]):
-            util.fatal("cannot place number {} at an invalid position ({}, {})".format(
-                number, row, column))
+        shift = tile_shift(row, column)
         if number == SPACE_VALUE:
-            self._space_position = (row, column)
-        self._arrangement[row][column] = number
+            self._space_index = row * MATRIX_SIZE + column
+            number = SPACE_TILE
+        self._state = (self._state & ~(TILE_MASK << shift)) | (number << shift)
 
     def fetch(self, row: int, column: int) -> int:
         """
-        Return the number in the position (row, column) of Matrix.
+        Return the number in the position (row, column) of Matrix. The position is not checked, thus must be valid.
         """
-        if not boundary_check([row, column]):
-            util.fatal("cannot fetch number at an invalid position ({}, {})".format(
-                row, column))
-        return self._arrangement[row][column]
+        tile = (self._state >> tile_shift(row, column)) & TILE_MASK
+        return SPACE_VALUE if tile == SPACE_TILE else tile
 
     def exchange(self, x1: int, y1: int, x2: int, y2: int) -> None:
         """
-        Exchange the numbers on the position (x1, y1) and (x2, y2).
+        Exchange the numbers on the position (x1, y1) and (x2, y2). Nothing happens if any position is invalid.
         """
-        if not boundary_check([x1, x2, y1, y2]):
+        if not (0 <= x1 < MATRIX_SIZE and 0 <= y1 < MATRIX_SIZE and 0 <= x2 < MATRIX_SIZE and 0 <= y2 < MATRIX_SIZE):
             return
-        temp = self.fetch(x1, y1)
-        self.place(x1, y1, self.fetch(x2, y2))
-        self.place(x2, y2, temp)
+        shift1, shift2 = tile_shift(x1, y1), tile_shift(x2, y2)
+        tile1 = (self._state >> shift1) & TILE_MASK
+        tile2 = (self._state >> shift2) & TILE_MASK
+        if tile1 == SPACE_TILE:
+            self._space_index = x2 * MATRIX_SIZE + y2
+        elif tile2 == SPACE_TILE:
+            self._space_index = x1 * MATRIX_SIZE + y1
+        difference = tile1 ^ tile2
+        self._state ^= (difference << shift1) | (difference << shift2)
+
+    def _move(self, move: tuple[Direction, int, int, int]) -> Matrix:
+        """
+        Protected function, do not call directly. Produce a new matrix by applying an entry of `MOVES` to self.
+
+        :param move: A precomputed move, whose space tile position must be the same as self.
+        :return: A new matrix with the space tile moved, and self as its parent.
+        """
+        mat = Matrix._empty()
+        mat._state = apply_move(self._state, move)
+        mat._space_index = move[1]
+        mat.parent = self
+        mat.last_direction = move[0]
+        return mat
 
     def play(self, forbidden_directions: list[Direction] = None) -> list[Matrix]:
         """
@@ -160,21 +282,9 @@ class Matrix:
         :param forbidden_directions: A list containing directions the space tile is forbidden to move towards
         :return: A list containing new matrices, if any, with different arrangements by moving the space tile.
         """
-        new_matrices = []
-        space_x, space_y = self._space_position
-        for direction in Direction:
-            if forbidden_directions is not None and direction in forbidden_directions:
-                continue
-            delta_x, delta_y = direction.value
-            x, y = space_x + delta_x, space_y + delta_y
-            if not boundary_check([x, y]):
-                continue
-            mat = self.clone()
-            mat.exchange(space_x, space_y, x, y)
-            mat.parent = self
-            mat.last_direction = direction
-            new_matrices.append(mat)
-        return new_matrices
+        if forbidden_directions is None:
+            return [self._move(move) for move in MOVES[self._space_index]]
+        return [self._move(move) for move in MOVES[self._space_index] if move[0] not in forbidden_directions]
 
     def play_towards(self, towards_directions: list[Direction]) -> list[Matrix]:
         """
@@ -186,19 +296,8 @@ class Matrix:
         :param towards_directions: Directions to move the space tile.
         :return: A list containing new matrices generated through moving the space towards specified directions.
         """
-        new_matrices = []
-        space_x, space_y = self._space_position
-        for direction in towards_directions:
-            delta_x, delta_y = direction.value
-            x, y = space_x + delta_x, space_y + delta_y
-            if not boundary_check([x, y]):
-                continue
-            mat = self.clone()
-            mat.exchange(space_x, space_y, x, y)
-            mat.parent = self
-            mat.last_direction = direction
-            new_matrices.append(mat)
-        return new_matrices
+        moves = MOVES_TOWARDS[self._space_index]
+        return [self._move(moves[direction]) for direction in towards_directions if moves[direction] is not None]
 
     def play_only(self, direction: Direction) -> Matrix | None:
         """
@@ -209,13 +308,7 @@ class Matrix:
         :return: A new matrix through moving the space tile towards given direction, or None if the space tile is out
             of boundary.
         """
-        space_x, space_y = self._space_position
-        delta_x, delta_y = direction.value
-        x, y = space_x + delta_x, space_y + delta_y
-        if not boundary_check([x, y]):
+        move = MOVES_TOWARDS[self._space_index][direction]
+        if move is None:
             return None
-        mat = self.clone()
-        mat.exchange(space_x, space_y, x, y)
-        mat.parent = self
-        mat.last_direction = direction
-        return mat
+        return self._move(move)
@@ -6,6 +6,15 @@ A module containing utilities to code easily.
 """
 import sys
 
+try:
+    from numba import njit
+except ImportError:
+    def njit(*_args, **_kwargs):
+        """
+        Fallback of `numba.njit` when Numba is not installed, leaving the function as plain Python.
+        """
+        return lambda function: function
+
 
 def fatal(error: str):
     print("Error: {}.".format(error), file=sys.stderr)